@@ -17,8 +17,8 @@ This establishes the basic building blocks for combat:
 
 from evennia.scripts.scripts import DefaultScript
 from evennia.typeclasses.attributes import AttributeProperty
-from evennia.utils import evtable
 from evennia.utils.create import create_script
+from evennia.utils.utils import crop, display_len
 
 from . import rules
 
@@ -271,15 +271,21 @@ class EvAdventureCombatBaseHandler(DefaultScript):
             obj (any): The Typeclassed entity to store the CombatHandler Script on. This could be
                 a location (for turn-based combat) or a Character (for twitch-based combat).
         Keyword Args:
-            combathandler_key (str): They key name for the script. Will be 'combathandler' by
-                default.
+            key (str): The key name for the script. Will be 'combathandler' by default.
+            combathandler_key (str): Alias for `key`.
             **kwargs: Arguments to the Script, if it is created.
 
+        Notes:
+            The handler is cached on `obj.ndb` so that getting an existing one doesn't need a
+            database lookup. Evennia runs all commands and tickers in the same (reactor) thread,
+            so there is no risk of two handlers being created at the same time.
+
         """
         if not obj:
             raise CombatFailure("Cannot start combat without a place to do it!")
 
         combathandler_key = kwargs.pop("key", "combathandler")
+        combathandler_key = kwargs.pop("combathandler_key", combathandler_key)
         combathandler = obj.ndb.combathandler
         if not combathandler or not combathandler.id:
             combathandler = obj.scripts.get(combathandler_key).first()
@@ -325,7 +331,9 @@ class EvAdventureCombatBaseHandler(DefaultScript):
 
         exclude = []
         if not broadcast and combatant:
-            exclude = [obj for obj in location_objs if obj is not combatant]
+            # a set makes the exclusion check in msg_contents a fast lookup
+            exclude = set(location_objs)
+            exclude.discard(combatant)
 
         location.msg_contents(
             message,
@@ -343,7 +351,8 @@ class EvAdventureCombatBaseHandler(DefaultScript):
             combatant (EvAdventureCharacter, EvAdventureNPC): The combatant to get.
 
         Returns:
-            EvTable: A table representing the current state of combat.
+            str: A three-column text representing the current state of combat. All lines
+                have the same display width, at most 78 characters.
 
         Example:
         ::
@@ -360,36 +369,46 @@ class EvAdventureCombatBaseHandler(DefaultScript):
         allies.insert(0, combatant)
         nallies, nenemies = len(allies), len(enemies)
 
-        # prepare colors and hurt-levels
-        allies = [f"{ally} ({ally.hurt_level})" for ally in allies]
-        enemies = [f"{enemy} ({enemy.hurt_level})" for enemy in enemies]
+        # prepare colors and hurt-levels. Each side gets half of a 78-character line (minus the
+        # margins and the 'vs' column), so too long names are cropped to fit. We store the visible
+        # width of each entry along with it, since the color markup doesn't take up any space
+        # when displayed
+        colwidth = (78 - 8) // 2
 
-        # the center column with the 'vs'
-        vs_column = ["" for _ in range(max(nallies, nenemies))]
-        vs_column[len(vs_column) // 2] = "|wvs|n"
+        def _get_entry(comb):
+            hurt_level = f" ({comb.hurt_level})"
+            entry = crop(str(comb), width=colwidth - display_len(hurt_level)) + hurt_level
+            return entry, display_len(entry)
+
+        allies = [_get_entry(ally) for ally in allies]
+        enemies = [_get_entry(enemy) for enemy in enemies]
 
         # the two allies / enemies columns should be centered vertically
         diff = abs(nallies - nenemies)
         top_empty = diff // 2
         bot_empty = diff - top_empty
-        topfill = ["" for _ in range(top_empty)]
-        botfill = ["" for _ in range(bot_empty)]
+        topfill = [("", 0)] * top_empty
+        botfill = [("", 0)] * bot_empty
 
         if nallies >= nenemies:
             enemies = topfill + enemies + botfill
         else:
             allies = topfill + allies + botfill
 
-        # make a table with three columns
-        return evtable.EvTable(
-            table=[
-                evtable.EvColumn(*allies, align="l"),
-                evtable.EvColumn(*vs_column, align="c"),
-                evtable.EvColumn(*enemies, align="r"),
-            ],
-            border=None,
-            maxwidth=78,
-        )
+        # the center column with the 'vs'
+        vs_row = len(allies) // 2
+
+        # build three columns; allies left-aligned, enemies right-aligned
+        ally_width = max(width for _, width in allies)
+        enemy_width = max(width for _, width in enemies)
+        rows = []
+        for irow, ((ally, ally_len), (enemy, enemy_len)) in enumerate(zip(allies, enemies)):
+            vs = "|wvs|n" if irow == vs_row else "  "
+            rows.append(
+                f" {ally}{' ' * (ally_width - ally_len)}  {vs}  "
+                f"{' ' * (enemy_width - enemy_len)}{enemy} "
+            )
+        return "\n".join(rows)
 
     def get_sides(self, combatant):
         """
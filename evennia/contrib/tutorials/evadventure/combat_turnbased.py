@@ -19,13 +19,14 @@ action that takes several vulnerable turns to complete.
 """
 
 
+import heapq
 import random
-from collections import defaultdict
+from functools import partial
 
 from evennia import AttributeProperty, CmdSet, Command, EvMenu
-from evennia.utils import inherits_from, list_to_string
+from evennia.utils import list_to_string
 
-from .characters import EvAdventureCharacter
+from .characters import LivingMixin
 from .combat_base import (
     CombatAction,
     CombatActionAttack,
@@ -58,6 +59,20 @@ class CombatActionFlee(CombatAction):
         if self.combatant not in combathandler.fleeing_combatants:
             # we record the turn on which we started fleeing
             combathandler.fleeing_combatants[self.combatant] = self.combathandler.turn
+            flee_queue = combathandler.ndb._flee_queue
+            if flee_queue is not None:
+                # if not set, the queue will be rebuilt from fleeing_combatants when next used
+                heapq.heappush(
+                    flee_queue,
+                    (
+                        combathandler.turn + combathandler.flee_timeout - 1,
+                        self.combatant.id,
+                        self.combatant,
+                    ),
+                )
+            fleeing_set = combathandler.ndb._fleeing_set
+            if fleeing_set is not None:
+                fleeing_set.add(self.combatant)
 
         # show how many turns until successful flight
         current_turn = combathandler.turn
@@ -101,9 +116,9 @@ class EvAdventureTurnbasedCombatHandler(EvAdventureCombatBaseHandler):
     # as {combatant: actiondict, ...}
     combatants = AttributeProperty(dict)
 
-    # who has advantage against whom
-    advantage_matrix = AttributeProperty(defaultdict(dict))
-    disadvantage_matrix = AttributeProperty(defaultdict(dict))
+    # who has advantage against whom, as {(combatant, target), ...}
+    advantage_pairs = AttributeProperty(set)
+    disadvantage_pairs = AttributeProperty(set)
 
     fleeing_combatants = AttributeProperty(dict)
     defeated_combatants = AttributeProperty(list)
@@ -123,7 +138,7 @@ class EvAdventureTurnbasedCombatHandler(EvAdventureCombatBaseHandler):
                 some future boost)
 
         """
-        self.advantage_matrix[combatant][target] = True
+        self.advantage_pairs.add((combatant, target))
 
     def give_disadvantage(self, combatant, target, **kwargs):
         """
@@ -135,7 +150,7 @@ class EvAdventureTurnbasedCombatHandler(EvAdventureCombatBaseHandler):
                 an enemy.
 
         """
-        self.disadvantage_matrix[combatant][target] = True
+        self.disadvantage_pairs.add((combatant, target))
 
     def has_advantage(self, combatant, target, **kwargs):
         """
@@ -146,9 +161,15 @@ class EvAdventureTurnbasedCombatHandler(EvAdventureCombatBaseHandler):
             target (Character or NPC): The target to check advantage against.
 
         """
-        return target in self.fleeing_combatants or bool(
-            self.advantage_matrix[combatant].pop(target, False)
-        )
+        if target in self._get_fleeing_set():
+            return True
+        # an advantage is used up when checked
+        pair = (combatant, target)
+        advantage_pairs = self.advantage_pairs
+        if pair in advantage_pairs:
+            advantage_pairs.discard(pair)
+            return True
+        return False
 
     def has_disadvantage(self, combatant, target):
         """
@@ -159,7 +180,13 @@ class EvAdventureTurnbasedCombatHandler(EvAdventureCombatBaseHandler):
             target (Character or NPC): The target to check disadvantage against.
 
         """
-        return bool(self.disadvantage_matrix[combatant].pop(target, False))
+        # a disadvantage is used up when checked
+        pair = (combatant, target)
+        disadvantage_pairs = self.disadvantage_pairs
+        if pair in disadvantage_pairs:
+            disadvantage_pairs.discard(pair)
+            return True
+        return False
 
     def add_combatant(self, combatant):
         """
@@ -174,6 +201,8 @@ class EvAdventureTurnbasedCombatHandler(EvAdventureCombatBaseHandler):
         """
         if combatant not in self.combatants:
             self.combatants[combatant] = self.fallback_action_dict
+            self._clear_combatant_caches()
+            self._clear_combatant_state(combatant)
             return True
         return False
 
@@ -187,10 +216,93 @@ class EvAdventureTurnbasedCombatHandler(EvAdventureCombatBaseHandler):
 
         """
         self.combatants.pop(combatant, None)
+        self._clear_combatant_caches()
+        self._clear_combatant_state(combatant)
         # clean up menu if it exists
         if combatant.ndb._evmenu:
             combatant.ndb._evmenu.close_menu()
 
+    def _clear_combatant_caches(self):
+        """
+        Clear the non-persistent data that depends on who is in combat. This must be called
+        whenever combatants are added or removed.
+
+        """
+        self.ndb._sides_cache = None
+        self.ndb._turn_order = None
+
+    def _clear_combatant_state(self, combatant):
+        """
+        Clear the data stored for a single combatant, including their fleeing status and the
+        non-persistent caches built from it. This must be called whenever a combatant enters
+        or leaves combat (including when defeated), so nothing is left over from an earlier
+        fight.
+
+        Args:
+            combatant (EvAdventureCharacter, EvAdventureNPC): The combatant to clear.
+
+        """
+        if self.ndb._action_cache:
+            self.ndb._action_cache.pop(combatant, None)
+        if self.ndb._queued_action_classes:
+            self.ndb._queued_action_classes.pop(combatant, None)
+        if self.ndb._fleeing_set:
+            self.ndb._fleeing_set.discard(combatant)
+        fleeing_combatants = self.fleeing_combatants
+        if combatant in fleeing_combatants:
+            del fleeing_combatants[combatant]
+            # a heap can't drop single entries; rebuild it from fleeing_combatants when next used
+            self.ndb._flee_queue = None
+
+    def _get_flee_queue(self):
+        """
+        Get the (non-persistent) queue of fleeing combatants, ordered by the turn they will
+        escape on. It's rebuilt from `fleeing_combatants` if needed (like after a reload).
+
+        Returns:
+            list: A heap of tuples `(escape_turn, combatant_id, combatant)`.
+
+        """
+        flee_queue = self.ndb._flee_queue
+        if flee_queue is None:
+            flee_timeout = self.flee_timeout
+            flee_queue = [
+                (started_fleeing + flee_timeout - 1, combatant.id, combatant)
+                for combatant, started_fleeing in self.fleeing_combatants.items()
+            ]
+            heapq.heapify(flee_queue)
+            self.ndb._flee_queue = flee_queue
+        return flee_queue
+
+    def _get_fleeing_set(self):
+        """
+        Get the (non-persistent) set of combatants currently fleeing. This avoids loading
+        `fleeing_combatants` from the database for every advantage check. It's rebuilt from
+        `fleeing_combatants` if needed (like after a reload).
+
+        Returns:
+            set: The combatants currently fleeing.
+
+        """
+        fleeing_set = self.ndb._fleeing_set
+        if fleeing_set is None:
+            fleeing_set = self.ndb._fleeing_set = set(self.fleeing_combatants)
+        return fleeing_set
+
+    def _get_rng(self):
+        """
+        Get this combat's own (non-persistent) random generator, so as to not share the global
+        random state with every other combat running at the same time.
+
+        Returns:
+            random.Random: The random generator.
+
+        """
+        rng = self.ndb._rng
+        if rng is None:
+            rng = self.ndb._rng = random.Random()
+        return rng
+
     def start_combat(self, **kwargs):
         """
         This actually starts the combat. It's safe to run this multiple times
@@ -213,11 +325,12 @@ class EvAdventureTurnbasedCombatHandler(EvAdventureCombatBaseHandler):
     def get_combat_summary(self, combatant):
         """Add your next queued action to summary"""
         summary = super().get_combat_summary(combatant)
-        next_action = self.get_next_action_dict(combatant) or {"key": "hold"}
+        # get_next_action_dict always returns a dict (the fallback if nothing is queued)
+        next_action_key = self.get_next_action_dict(combatant)["key"]
         next_repeat = self.time_until_next_repeat()
 
         summary = (
-            f"{summary}\n Your queued action: [|b{next_action['key']}|n] (|b{next_repeat}s|n until"
+            f"{summary}\n Your queued action: [|b{next_action_key}|n] (|b{next_repeat}s|n until"
             " next round,\n or until all combatants have chosen their next action)."
         )
         return summary
@@ -246,18 +359,35 @@ class EvAdventureTurnbasedCombatHandler(EvAdventureCombatBaseHandler):
             enemies = [comb for comb in self.combatants if comb != combatant]
         else:
             # otherwise, enemies/allies depend on who combatant is
-            pcs = [comb for comb in self.combatants if inherits_from(comb, EvAdventureCharacter)]
-            npcs = [comb for comb in self.combatants if comb not in pcs]
-            if combatant in pcs:
+            pcs, pcs_set, npcs = self._get_pcs_and_npcs()
+            if combatant in pcs_set:
                 # combatant is a PC, so NPCs are all enemies
                 allies = [comb for comb in pcs if comb != combatant]
-                enemies = npcs
+                enemies = list(npcs)
             else:
                 # combatant is an NPC, so PCs are all enemies
                 allies = [comb for comb in npcs if comb != combatant]
-                enemies = pcs
+                enemies = list(pcs)
         return allies, enemies
 
+    def _get_pcs_and_npcs(self):
+        """
+        Split the combatants into PCs and NPCs. The result is cached (non-persistently) until
+        the combatants change or a new turn starts.
+
+        Returns:
+            tuple: A tuple `(pcs, pcs_set, npcs)`. These are shared with the cache and should not
+                be modified in-place.
+
+        """
+        sides = self.ndb._sides_cache
+        if sides is None:
+            pcs, npcs = [], []
+            for comb in self.combatants:
+                (pcs if comb.is_pc else npcs).append(comb)
+            sides = self.ndb._sides_cache = (pcs, set(pcs), npcs)
+        return sides
+
     def queue_action(self, combatant, action_dict):
         """
         Queue an action by adding the new actiondict.
@@ -267,12 +397,21 @@ class EvAdventureTurnbasedCombatHandler(EvAdventureCombatBaseHandler):
             action_dict (dict): A dict describing the action class by name along with properties.
 
         """
-        self.combatants[combatant] = action_dict
+        # resolve the action class right away rather than every time the action is executed
+        queued_action_classes = self.ndb._queued_action_classes
+        if queued_action_classes is None:
+            queued_action_classes = self.ndb._queued_action_classes = {}
+        queued_action_classes[combatant] = self.action_classes[action_dict["key"]]
+
+        combatants = self.combatants
+        combatants[combatant] = action_dict
 
         # track who inserted actions this turn (non-persistent)
-        did_action = set(self.ndb.did_action or set())
+        did_action = self.ndb.did_action
+        if did_action is None:
+            did_action = self.ndb.did_action = set()
         did_action.add(combatant)
-        if len(did_action) >= len(self.combatants):
+        if len(did_action) >= len(combatants):
             # everyone has inserted an action. Start next turn without waiting!
             self.force_repeat()
 
@@ -287,7 +426,9 @@ class EvAdventureTurnbasedCombatHandler(EvAdventureCombatBaseHandler):
             dict: The next action-dict in the queue.
 
         """
-        return self.combatants.get(combatant, self.fallback_action_dict)
+        action_dict = self.combatants.get(combatant)
+        # only look up the fallback Attribute if we actually need it
+        return self.fallback_action_dict if action_dict is None else action_dict
 
     def execute_next_action(self, combatant):
         """
@@ -300,60 +441,101 @@ class EvAdventureTurnbasedCombatHandler(EvAdventureCombatBaseHandler):
 
         """
         # this gets the next dict and rotates the queue
-        action_dict = self.combatants.get(combatant, self.fallback_action_dict)
-
-        # use the action-dict to select and create an action from an action class
-        action_class = self.action_classes[action_dict["key"]]
-        action = action_class(self, combatant, action_dict)
+        combatants = self.combatants
+        action_dict = combatants.get(combatant, self.fallback_action_dict)
+
+        # use the action-dict to select and create an action from an action class. Repeating
+        # actions (like attacking the same target every turn) reuse the action from last turn.
+        # The action-dict is unpickled anew from the Attribute every time, so we must compare
+        # by value rather than by identity.
+        action_cache = self.ndb._action_cache
+        if action_cache is None:
+            action_cache = self.ndb._action_cache = {}
+        cached_action_dict, action = action_cache.get(combatant, (None, None))
+        queued_action_classes = self.ndb._queued_action_classes or {}
+        if action is None or cached_action_dict != action_dict:
+            action_class = queued_action_classes.get(combatant)
+            if action_class is None:
+                # the fallback action is never queued, so its class is not resolved in advance
+                action_class = self.action_classes[action_dict["key"]]
+            action = action_class(self, combatant, action_dict)
+            action_cache[combatant] = (dict(action_dict), action)
 
         action.execute()
         action.post_execute()
 
-        if action_dict.get("repeat", False):
-            # queue the action again *without updating the *.ndb.did_action list* (otherwise
-            # we'd always auto-end the turn if everyone used repeating actions and there'd be
-            # no time to change it before the next round)
-            self.combatants[combatant] = action_dict
-        else:
-            # if not a repeat, set the fallback action
-            self.combatants[combatant] = self.fallback_action_dict
+        # Each combatant has a single action slot, so a repeating action is still in place
+        # and we don't need to re-store it (and re-save the Attribute). Note that this does
+        # not update the *.ndb.did_action list* (otherwise we'd always auto-end the turn if
+        # everyone used repeating actions and there'd be no time to change it before the next
+        # round)
+        if not action_dict.get("repeat", False):
+            # if not a repeat, set the fallback action (unless it's already queued)
+            fallback_action_dict = self.fallback_action_dict
+            if action_dict != fallback_action_dict:
+                combatants[combatant] = fallback_action_dict
+                queued_action_classes.pop(combatant, None)
 
     def check_stop_combat(self):
         """Check if it's time to stop combat"""
 
+        # each access of the Attribute unpickles it anew, so only do so once
+        combatants = self.combatants
+
         # check if anyone is defeated
-        for combatant in list(self.combatants.keys()):
-            if combatant.hp <= 0:
-                # PCs roll on the death table here, NPCs die. Even if PCs survive, they
-                # are still out of the fight.
-                combatant.at_defeat()
-                self.combatants.pop(combatant)
-                self.defeated_combatants.append(combatant)
-                self.msg("|r$You() $conj(fall) to the ground, defeated.|n", combatant=combatant)
+        defeated = [comb for comb in combatants if comb.hp <= 0]
+        for combatant in defeated:
+            # PCs roll on the death table here, NPCs die. Even if PCs survive, they
+            # are still out of the fight.
+            combatant.at_defeat()
+            self.msg("|r$You() $conj(fall) to the ground, defeated.|n", combatant=combatant)
+        if defeated:
+            # update the Attributes in one go; every change to them means re-saving them in full
+            combatants = {
+                comb: action_dict
+                for comb, action_dict in combatants.items()
+                if comb not in defeated
+            }
+            self.combatants = combatants
+            self.defeated_combatants = list(self.defeated_combatants) + defeated
+            self._clear_combatant_caches()
+            for combatant in defeated:
+                self._clear_combatant_state(combatant)
 
         # check if anyone managed to flee
-        flee_timeout = self.flee_timeout
-        for combatant, started_fleeing in self.fleeing_combatants.items():
-            if self.turn - started_fleeing >= flee_timeout - 1:
+        flee_queue = self._get_flee_queue()
+        turn = self.turn
+        fled = False
+        while flee_queue and flee_queue[0][0] <= turn:
+            _, _, combatant = heapq.heappop(flee_queue)
+            if combatant in combatants:
                 # if they are still alive/fleeing and have been fleeing long enough, escape
                 self.msg("|y$You() successfully $conj(flee) from combat.|n", combatant=combatant)
                 self.remove_combatant(combatant)
+                fled = True
+        if fled:
+            # remove_combatant worked on its own copy of the Attribute
+            combatants = self.combatants
 
         # check if one side won the battle
-        if not self.combatants:
+        if not combatants:
             # noone left in combat - maybe they killed each other or all fled
             surviving_combatant = None
             allies, enemies = (), ()
         else:
             # grab a random survivor and check of they have any living enemies.
-            surviving_combatant = random.choice(list(self.combatants.keys()))
+            surviving_combatant = self._get_rng().choice(list(combatants))
             allies, enemies = self.get_sides(surviving_combatant)
 
         if not enemies:
             # if one way or another, there are no more enemies to fight
             still_standing = list_to_string(f"$You({comb.key})" for comb in allies)
-            knocked_out = list_to_string(comb for comb in self.defeated_combatants if comb.hp > 0)
-            killed = list_to_string(comb for comb in self.defeated_combatants if comb.hp <= 0)
+            # split the defeated in a single pass
+            knocked_out, killed = [], []
+            for comb in self.defeated_combatants:
+                (knocked_out if comb.hp > 0 else killed).append(comb)
+            knocked_out = list_to_string(knocked_out)
+            killed = list_to_string(killed)
 
             if still_standing:
                 txt = [f"The combat is over. {still_standing} are still standing."]
@@ -363,7 +545,7 @@ class EvAdventureTurnbasedCombatHandler(EvAdventureCombatBaseHandler):
                 txt.append(f"{knocked_out} were taken down, but will live.")
             if killed:
                 txt.append(f"{killed} were killed.")
-            self.msg(txt)
+            self.msg("\n".join(txt))
             self.stop_combat()
 
     def at_repeat(self):
@@ -373,16 +555,18 @@ class EvAdventureTurnbasedCombatHandler(EvAdventureCombatBaseHandler):
 
         """
         self.turn += 1
-        # random turn order
-        combatants = list(self.combatants.keys())
-        random.shuffle(combatants)  # shuffles in place
+        self.ndb._sides_cache = None
+        self.ndb.did_action = set()
+        # random turn order. The list is reused until the combatants change
+        turn_order = self.ndb._turn_order
+        if turn_order is None:
+            turn_order = self.ndb._turn_order = list(self.combatants)
+        self._get_rng().shuffle(turn_order)  # shuffles in place
 
         # do everyone's next queued combat action
-        for combatant in combatants:
+        for combatant in turn_order:
             self.execute_next_action(combatant)
 
-        self.ndb.did_action = set()
-
         # check if one side won the battle
         self.check_stop_combat()
 
@@ -407,13 +591,25 @@ def _get_combathandler(caller, turn_timeout=30, flee_time=3, combathandler_key="
         turn_timeout (int): After this time, the turn will roll around.
         flee_time (int): How many turns it takes to flee.
 
+    Notes:
+        The combat menu stores the handler as `.combathandler` on itself, so the wizard
+        nodes can reuse it instead of looking it up every time.
+
     """
-    return EvAdventureTurnbasedCombatHandler.get_or_create_combathandler(
+    evmenu = caller.ndb._evmenu
+    combathandler = getattr(evmenu, "combathandler", None)
+    if combathandler and combathandler.id and combathandler.obj == caller.location:
+        return combathandler
+
+    combathandler = EvAdventureTurnbasedCombatHandler.get_or_create_combathandler(
         caller.location,
         interval=turn_timeout,
         attributes=[("flee_time", flee_time)],
         key=combathandler_key,
     )
+    if evmenu:
+        evmenu.combathandler = combathandler
+    return combathandler
 
 
 def _queue_action(caller, raw_string, **kwargs):
@@ -430,6 +626,10 @@ def _rerun_current_node(caller, raw_string, **kwargs):
     return None, kwargs
 
 
+# the abort option does not depend on the wizard state, so it can be shared
+_WIZARD_ABORT_OPTION = {"key": ("abort", "a"), "goto": "node_combat"}
+
+
 def _get_default_wizard_options(caller, **kwargs):
     """
     Get the standard wizard options for moving back/forward/abort. This can be appended to
@@ -437,14 +637,14 @@ def _get_default_wizard_options(caller, **kwargs):
 
     """
 
-    return [
-        {"key": ("back", "b"), "goto": (_step_wizard, {**kwargs, **{"step": "back"}})},
-        {"key": ("abort", "a"), "goto": "node_combat"},
+    return (
+        {"key": ("back", "b"), "goto": (_step_wizard_back, kwargs)},
+        _WIZARD_ABORT_OPTION,
         {
             "key": "_default",
             "goto": (_rerun_current_node, kwargs),
         },
-    ]
+    )
 
 
 def _step_wizard(caller, raw_string, **kwargs):
@@ -458,8 +658,10 @@ def _step_wizard(caller, raw_string, **kwargs):
     steps = kwargs.get("steps", [])
     nsteps = len(steps)
     istep = kwargs.get("istep", -1)
-    # one of abort, back, forward
-    step_direction = kwargs.get("step", "forward")
+    # back or forward (abort goes straight to node_combat without passing through here). The
+    # kwargs are passed on as the state of the next node, so we pop the direction to not have
+    # it stick around for the next step
+    step_direction = kwargs.pop("step", "forward")
 
     if step_direction == "back":
         # step back in wizard
@@ -478,6 +680,10 @@ def _step_wizard(caller, raw_string, **kwargs):
             return steps[istep], kwargs
 
 
+# stepping back only needs the direction added, so we bind it once instead of copying kwargs
+_step_wizard_back = partial(_step_wizard, step="back")
+
+
 def node_choose_enemy_target(caller, raw_string, **kwargs):
     """
     Choose an enemy as a target for an action
@@ -494,7 +700,7 @@ def node_choose_enemy_target(caller, raw_string, **kwargs):
             "desc": target.get_display_name(caller),
             "goto": (
                 _step_wizard,
-                {**kwargs, **{"action_dict": {**action_dict, **{"target": target}}}},
+                {**kwargs, "action_dict": {**action_dict, "target": target}},
             ),
         }
         for target in enemies
@@ -518,7 +724,7 @@ def node_choose_enemy_recipient(caller, raw_string, **kwargs):
             "desc": target.get_display_name(caller),
             "goto": (
                 _step_wizard,
-                {**kwargs, **{"action_dict": {**action_dict, **{"recipient": target}}}},
+                {**kwargs, "action_dict": {**action_dict, "recipient": target}},
             ),
         }
         for target in enemies
@@ -543,10 +749,7 @@ def node_choose_allied_target(caller, raw_string, **kwargs):
             "desc": "Yourself",
             "goto": (
                 _step_wizard,
-                {
-                    **kwargs,
-                    **{"action_dict": {**action_dict, **{"target": caller}}},
-                },
+                {**kwargs, "action_dict": {**action_dict, "target": caller}},
             ),
         }
     ]
@@ -556,10 +759,7 @@ def node_choose_allied_target(caller, raw_string, **kwargs):
                 "desc": target.get_display_name(caller),
                 "goto": (
                     _step_wizard,
-                    {
-                        **kwargs,
-                        **{"action_dict": {**action_dict, **{"target": target}}},
-                    },
+                    {**kwargs, "action_dict": {**action_dict, "target": target}},
                 ),
             }
             for target in allies
@@ -585,10 +785,7 @@ def node_choose_allied_recipient(caller, raw_string, **kwargs):
             "desc": "Yourself",
             "goto": (
                 _step_wizard,
-                {
-                    **kwargs,
-                    **{"action_dict": {**action_dict, **{"recipient": caller}}},
-                },
+                {**kwargs, "action_dict": {**action_dict, "recipient": caller}},
             ),
         }
     ]
@@ -598,15 +795,7 @@ def node_choose_allied_recipient(caller, raw_string, **kwargs):
                 "desc": target.get_display_name(caller),
                 "goto": (
                     _step_wizard,
-                    {
-                        **kwargs,
-                        **{
-                            "action_dict": {
-                                **action_dict,
-                                **{"recipient": target},
-                            }
-                        },
-                    },
+                    {**kwargs, "action_dict": {**action_dict, "recipient": target}},
                 ),
             }
             for target in allies
@@ -616,6 +805,17 @@ def node_choose_allied_recipient(caller, raw_string, **kwargs):
     return text, options
 
 
+# the abilities one can choose between for stunts
+_STUNT_ABILITIES = (
+    Ability.STR,
+    Ability.DEX,
+    Ability.CON,
+    Ability.INT,
+    Ability.WIS,
+    Ability.CHA,
+)
+
+
 def node_choose_ability(caller, raw_string, **kwargs):
     """
     Select an ability to use/boost etc.
@@ -630,26 +830,46 @@ def node_choose_ability(caller, raw_string, **kwargs):
                 _step_wizard,
                 {
                     **kwargs,
-                    **{
-                        "action_dict": {**action_dict, **{"stunt_type": abi, "defense_type": abi}},
-                    },
+                    "action_dict": {**action_dict, "stunt_type": abi, "defense_type": abi},
                 },
             ),
         }
-        for abi in (
-            Ability.STR,
-            Ability.DEX,
-            Ability.CON,
-            Ability.INT,
-            Ability.INT,
-            Ability.WIS,
-            Ability.CHA,
-        )
+        for abi in _STUNT_ABILITIES
     ]
     options.extend(_get_default_wizard_options(caller, **kwargs))
     return text, options
 
 
+def _get_backpack_items(caller, wieldable=False):
+    """
+    Get the usable (or wieldable) items in the caller's backpack. The wizard may render the same
+    node several times (on bad input or when stepping back), so the lists are cached on the menu
+    until the caller returns to `node_combat`.
+
+    Args:
+        caller (EvAdventureCharacter): The one choosing an item.
+        wieldable (bool): Get wieldable items instead of usable ones.
+
+    Returns:
+        list: The items to choose from.
+
+    """
+    evmenu = caller.ndb._evmenu
+    cache = getattr(evmenu, "backpack_items", None)
+    if cache is None:
+        cache = {}
+        if evmenu:
+            evmenu.backpack_items = cache
+    items = cache.get(wieldable)
+    if items is None:
+        if wieldable:
+            items = caller.equipment.get_wieldable_objects_from_backpack()
+        else:
+            items = caller.equipment.get_usable_objects_from_backpack()
+        cache[wieldable] = items
+    return items
+
+
 def node_choose_use_item(caller, raw_string, **kwargs):
     """
     Choose item to use.
@@ -663,10 +883,10 @@ def node_choose_use_item(caller, raw_string, **kwargs):
             "desc": item.get_display_name(caller),
             "goto": (
                 _step_wizard,
-                {**kwargs, **{"action_dict": {**action_dict, **{"item": item}}}},
+                {**kwargs, "action_dict": {**action_dict, "item": item}},
             ),
         }
-        for item in caller.equipment.get_usable_objects_from_backpack()
+        for item in _get_backpack_items(caller)
     ]
     if not options:
         text = "There are no usable items in your inventory!"
@@ -688,10 +908,10 @@ def node_choose_wield_item(caller, raw_string, **kwargs):
             "desc": item.get_display_name(caller),
             "goto": (
                 _step_wizard,
-                {**kwargs, **{"action_dict": {**action_dict, **{"item": item}}}},
+                {**kwargs, "action_dict": {**action_dict, "item": item}},
             ),
         }
-        for item in caller.equipment.get_wieldable_objects_from_backpack()
+        for item in _get_backpack_items(caller, wieldable=True)
     ]
     if not options:
         text = "There are no items in your inventory that you can wield!"
@@ -700,96 +920,127 @@ def node_choose_wield_item(caller, raw_string, **kwargs):
     return text, options
 
 
+# the starting action-dicts for the combat menu choices. These are shared, so they must never
+# be modified in-place - the wizard nodes always make new dicts when filling them in
+_ATTACK_ACTION_DICT = {"key": "attack", "target": None, "repeat": True}
+_BOOST_ACTION_DICT = {"key": "stunt", "advantage": True}
+_FOIL_ACTION_DICT = {"key": "stunt", "advantage": False}
+_USE_ACTION_DICT = {"key": "use", "item": None, "target": None}
+_WIELD_ACTION_DICT = {"key": "wield", "item": None}
+_FLEE_ACTION_DICT = {"key": "flee", "repeat": True}
+_HOLD_ACTION_DICT = {"key": "hold"}
+
+
+# the options of the main combat menu never change, so they are only built once (EvMenu
+# only reads them)
+_COMBAT_MENU_OPTIONS = (
+    {
+        "desc": "attack an enemy",
+        "goto": (
+            _step_wizard,
+            {
+                "steps": ["node_choose_enemy_target"],
+                "action_dict": _ATTACK_ACTION_DICT,
+            },
+        ),
+    },
+    {
+        "desc": "Stunt - gain a later advantage against a target",
+        "goto": (
+            _step_wizard,
+            {
+                "steps": [
+                    "node_choose_ability",
+                    "node_choose_enemy_target",
+                    "node_choose_allied_recipient",
+                ],
+                "action_dict": _BOOST_ACTION_DICT,
+            },
+        ),
+    },
+    {
+        "desc": "Stunt - give an enemy disadvantage against yourself or an ally",
+        "goto": (
+            _step_wizard,
+            {
+                "steps": [
+                    "node_choose_ability",
+                    "node_choose_enemy_recipient",
+                    "node_choose_allied_target",
+                ],
+                "action_dict": _FOIL_ACTION_DICT,
+            },
+        ),
+    },
+    {
+        "desc": "Use an item on yourself or an ally",
+        "goto": (
+            _step_wizard,
+            {
+                "steps": ["node_choose_use_item", "node_choose_allied_target"],
+                "action_dict": _USE_ACTION_DICT,
+            },
+        ),
+    },
+    {
+        "desc": "Use an item on an enemy",
+        "goto": (
+            _step_wizard,
+            {
+                "steps": ["node_choose_use_item", "node_choose_enemy_target"],
+                "action_dict": _USE_ACTION_DICT,
+            },
+        ),
+    },
+    {
+        "desc": "Wield/swap with an item from inventory",
+        "goto": (
+            _step_wizard,
+            {
+                "steps": ["node_choose_wield_item"],
+                "action_dict": _WIELD_ACTION_DICT,
+            },
+        ),
+    },
+    {
+        "desc": "flee!",
+        "goto": (_queue_action, {"action_dict": _FLEE_ACTION_DICT}),
+    },
+    {
+        "desc": "hold, doing nothing",
+        "goto": (_queue_action, {"action_dict": _HOLD_ACTION_DICT}),
+    },
+    {
+        "key": "_default",
+        "goto": "node_combat",
+    },
+)
+
+
 def node_combat(caller, raw_string, **kwargs):
     """Base combat menu"""
 
     combathandler = _get_combathandler(caller)
 
-    text = combathandler.get_combat_summary(caller)
-    options = [
-        {
-            "desc": "attack an enemy",
-            "goto": (
-                _step_wizard,
-                {
-                    "steps": ["node_choose_enemy_target"],
-                    "action_dict": {"key": "attack", "target": None, "repeat": True},
-                },
-            ),
-        },
-        {
-            "desc": "Stunt - gain a later advantage against a target",
-            "goto": (
-                _step_wizard,
-                {
-                    "steps": [
-                        "node_choose_ability",
-                        "node_choose_enemy_target",
-                        "node_choose_allied_recipient",
-                    ],
-                    "action_dict": {"key": "stunt", "advantage": True},
-                },
-            ),
-        },
-        {
-            "desc": "Stunt - give an enemy disadvantage against yourself or an ally",
-            "goto": (
-                _step_wizard,
-                {
-                    "steps": [
-                        "node_choose_ability",
-                        "node_choose_enemy_recipient",
-                        "node_choose_allied_target",
-                    ],
-                    "action_dict": {"key": "stunt", "advantage": False},
-                },
-            ),
-        },
-        {
-            "desc": "Use an item on yourself or an ally",
-            "goto": (
-                _step_wizard,
-                {
-                    "steps": ["node_choose_use_item", "node_choose_allied_target"],
-                    "action_dict": {"key": "use", "item": None, "target": None},
-                },
-            ),
-        },
-        {
-            "desc": "Use an item on an enemy",
-            "goto": (
-                _step_wizard,
-                {
-                    "steps": ["node_choose_use_item", "node_choose_enemy_target"],
-                    "action_dict": {"key": "use", "item": None, "target": None},
-                },
-            ),
-        },
-        {
-            "desc": "Wield/swap with an item from inventory",
-            "goto": (
-                _step_wizard,
-                {
-                    "steps": ["node_choose_wield_item"],
-                    "action_dict": {"key": "wield", "item": None},
-                },
-            ),
-        },
-        {
-            "desc": "flee!",
-            "goto": (_queue_action, {"action_dict": {"key": "flee", "repeat": True}}),
-        },
-        {
-            "desc": "hold, doing nothing",
-            "goto": (_queue_action, {"action_dict": {"key": "hold"}}),
-        },
-        {
-            "key": "_default",
-            "goto": "node_combat",
-        },
-    ]
+    evmenu = caller.ndb._evmenu
+    if evmenu:
+        # a new wizard run may start from here, so the backpack may have changed
+        evmenu.backpack_items = None
 
-    return text, options
+    return combathandler.get_combat_summary(caller), _COMBAT_MENU_OPTIONS
+
+
+# the nodes of the combat menu, started by the attack command
+_COMBAT_MENU_NODES = {
+    "node_choose_enemy_target": node_choose_enemy_target,
+    "node_choose_allied_target": node_choose_allied_target,
+    "node_choose_enemy_recipient": node_choose_enemy_recipient,
+    "node_choose_allied_recipient": node_choose_allied_recipient,
+    "node_choose_ability": node_choose_ability,
+    "node_choose_use_item": node_choose_use_item,
+    "node_choose_wield_item": node_choose_wield_item,
+    "node_combat": node_combat,
+}
 
 
 # Add this command to the Character cmdset to make turn-based combat available.
@@ -823,7 +1074,8 @@ class CmdTurnAttack(Command):
         if not target:
             return
 
-        if not hasattr(target, "hp"):
+        # a plain isinstance check, rather than probing for an `hp` Attribute
+        if not isinstance(target, LivingMixin):
             self.msg("You can't attack that.")
             return
         elif target.hp <= 0:
@@ -840,22 +1092,13 @@ class CmdTurnAttack(Command):
         combathandler.add_combatant(self.caller)
         combathandler.queue_action(self.caller, {"key": "attack", "target": target})
         combathandler.add_combatant(target)
-        target.msg("|rYou are attacked by {self.caller.get_display_name(self.caller)}!|n")
+        target.msg(f"|rYou are attacked by {self.caller.get_display_name(target)}!|n")
         combathandler.start_combat()
 
         # build and start the menu
         EvMenu(
             self.caller,
-            {
-                "node_choose_enemy_target": node_choose_enemy_target,
-                "node_choose_allied_target": node_choose_allied_target,
-                "node_choose_enemy_recipient": node_choose_enemy_recipient,
-                "node_choose_allied_recipient": node_choose_allied_recipient,
-                "node_choose_ability": node_choose_ability,
-                "node_choose_use_item": node_choose_use_item,
-                "node_choose_wield_item": node_choose_wield_item,
-                "node_combat": node_combat,
-            },
+            _COMBAT_MENU_NODES,
             startnode="node_combat",
             combathandler=combathandler,
             auto_look=False,
@@ -8,9 +8,9 @@ This implements a 'twitch' (aka DIKU or other traditional muds) style of MUD com
 """
 from evennia import AttributeProperty, CmdSet, default_cmds
 from evennia.commands.command import Command, InterruptCommand
-from evennia.utils.utils import display_len, inherits_from, list_to_string, pad, repeat, unrepeat
+from evennia.utils.utils import display_len, list_to_string, pad, repeat, unrepeat
 
-from .characters import EvAdventureCharacter
+from .characters import LivingMixin
 from .combat_base import (
     CombatActionAttack,
     CombatActionHold,
@@ -102,9 +102,10 @@ class EvAdventureCombatTwitchHandler(EvAdventureCombatBaseHandler):
             enemies = [comb for comb in combatants if comb != combatant]
         else:
             # otherwise, enemies/allies depend on who combatant is
-            pcs = [comb for comb in combatants if inherits_from(comb, EvAdventureCharacter)]
-            npcs = [comb for comb in combatants if comb not in pcs]
-            if combatant in pcs:
+            pcs, npcs = [], []
+            for comb in combatants:
+                (pcs if comb.is_pc else npcs).append(comb)
+            if combatant.is_pc:
                 # combatant is a PC, so NPCs are all enemies
                 allies = [comb for comb in pcs if comb != combatant]
                 enemies = npcs
@@ -246,7 +247,9 @@ class EvAdventureCombatTwitchHandler(EvAdventureCombatBaseHandler):
         """
         self.queue_action({"key": "hold", "dt": 0})  # make sure ticker is killed
         del self.obj.ndb.combathandler
-        self.obj.cmdset.remove(TwitchLookCmdSet)
+        if self.obj.cmdset.has(TwitchLookCmdSet):
+            # only re-merge the cmdsets if there is something to remove
+            self.obj.cmdset.remove(TwitchLookCmdSet)
         self.delete()
 
 
@@ -256,12 +259,13 @@ class _BaseTwitchCombatCommand(Command):
 
     """
 
-    def at_pre_command(self):
+    def at_pre_cmd(self):
         """
         Called before parsing.
 
         """
-        if not self.caller.location or not self.caller.location.allow_combat:
+        location = self.caller.location
+        if not location or not location.allow_combat:
             self.msg("Can't fight here!")
             raise InterruptCommand()
 
@@ -282,12 +286,14 @@ class _BaseTwitchCombatCommand(Command):
         if not args:
             return
 
-        if " on " in args:
-            lhs, rhs = args.split(" on ", 1)
+        lhs, sep, rhs = args.partition(" on ")
+        if sep:
+            lhs, rhs = lhs.strip(), rhs.strip()
         else:
+            # args is already stripped, so splitting on whitespace leaves nothing to strip
             lhs, *rhs = args.split(None, 1)
-            rhs = " ".join(rhs)
-        self.lhs, self.rhs = lhs.strip(), rhs.strip()
+            rhs = rhs[0] if rhs else ""
+        self.lhs, self.rhs = lhs, rhs
 
     def get_or_create_combathandler(self, target=None, combathandler_key="combathandler"):
         """
@@ -296,7 +302,7 @@ class _BaseTwitchCombatCommand(Command):
         """
         if target:
             # add/check combathandler to the target
-            if target.hp_max is None:
+            if not isinstance(target, LivingMixin):
                 self.msg("You can't attack that!")
                 raise InterruptCommand()
 
@@ -338,8 +344,9 @@ class CmdLook(default_cmds.CmdLook, _BaseTwitchCombatCommand):
         super().func()
         if not self.args:
             combathandler = self.get_or_create_combathandler()
-            txt = str(combathandler.get_combat_summary(self.caller))
-            maxwidth = max(display_len(line) for line in txt.strip().split("\n"))
+            txt = combathandler.get_combat_summary(self.caller)
+            # all lines of the summary have the same width, so we only need to measure one
+            maxwidth = display_len(txt.split("\n", 1)[0])
             self.msg(f"|r{pad(' Combat Status ', width=maxwidth, fillchar='-')}|n\n{txt}")
 
 
@@ -401,8 +408,8 @@ class CmdStunt(_BaseTwitchCombatCommand):
         stunt_type, recipient, target = None, None, None
 
         stunt_type, *args = args.split(None, 1)
-        if stunt_type:
-            stunt_type = stunt_type.strip().lower()
+        # the split already stripped whitespace, and the map keys are all lowercase
+        stunt_type = stunt_type.lower()
 
         args = args[0] if args else ""
 
@@ -412,7 +419,8 @@ class CmdStunt(_BaseTwitchCombatCommand):
         # validate input and try to guess if not given
 
         # ability is requried
-        if not stunt_type or stunt_type not in ABILITY_REVERSE_MAP:
+        ability = ABILITY_REVERSE_MAP.get(stunt_type)
+        if ability is None:
             self.msg(
                 f"'{stunt_type}' is not a valid ability. Pick one of"
                 f" {', '.join(ABILITY_REVERSE_MAP.keys())}."
@@ -435,15 +443,20 @@ class CmdStunt(_BaseTwitchCombatCommand):
 
         # save what we found so it can be accessed from func()
         self.advantage = advantage
-        self.stunt_type = ABILITY_REVERSE_MAP[stunt_type]
+        self.stunt_type = ability
         self.recipient = recipient.strip()
         self.target = target.strip()
 
     def func(self):
-        target = self.caller.search(self.target)
+        caller = self.caller
+        location = caller.location
+        # both searches are local, so gather the candidates (same as search() would) only once
+        candidates = caller.contents + [location] + location.contents
+
+        target = caller.search(self.target, candidates=candidates)
         if not target:
             return
-        recipient = self.caller.search(self.recipient)
+        recipient = caller.search(self.recipient, candidates=candidates)
         if not recipient:
             return
 
@@ -532,10 +545,10 @@ class CmdWield(_BaseTwitchCombatCommand):
     help_category = "combat"
 
     def parse(self):
+        super().parse()
         if not self.args:
             self.msg("What do you want to wield?")
             raise InterruptCommand()
-        super().parse()
 
     def func(self):
         item = self.caller.search(
@@ -555,6 +568,8 @@ class TwitchCombatCmdSet(CmdSet):
     """
 
     def at_cmdset_creation(self):
+        # note - the command instances can't be shared between cmdsets, since adding a command
+        # to a cmdset assigns its `.obj`, which is then used to prioritize one's own commands
         self.add(CmdAttack())
         self.add(CmdHold())
         self.add(CmdStunt())
@@ -78,6 +78,20 @@ class TestEvAdventureCombatBaseHandler(_CombatTestBase):
             mapping={"testchar": self.combatant, "testmonster": self.target},
         )
 
+    def test_combathandler_msg__private(self):
+        """Test sending a message only to the combatant"""
+
+        self.location.msg_contents = Mock()
+
+        self.combathandler.msg("test_message", combatant=self.combatant, broadcast=False)
+
+        self.location.msg_contents.assert_called_with(
+            "test_message",
+            exclude={self.target},
+            from_obj=self.combatant,
+            mapping={"testchar": self.combatant, "testmonster": self.target},
+        )
+
     def test_get_combat_summary(self):
         """Test combat summary"""
 
@@ -100,6 +114,38 @@ class TestEvAdventureCombatBaseHandler(_CombatTestBase):
             " testmonster (Perfect)  vs  testchar (Perfect) ",
         )
 
+    def test_get_combat_summary__uneven_sides(self):
+        """Test combat summary with more enemies than allies"""
+
+        target2 = create.create_object(EvAdventureMob, key="testmonster2", location=self.location)
+        target3 = create.create_object(EvAdventureMob, key="testmonster3", location=self.location)
+        self.combathandler.get_sides = Mock(return_value=([], [self.target, target2, target3]))
+
+        result = self.combathandler.get_combat_summary(self.combatant)
+
+        self.assertEqual(
+            strip_ansi(result),
+            "                          testmonster (Perfect) \n"
+            " testchar (Perfect)  vs  testmonster2 (Perfect) \n"
+            "                         testmonster3 (Perfect) ",
+        )
+
+    def test_get_combat_summary__long_key(self):
+        """Too long names are cropped to keep the combat summary within 78 characters"""
+
+        self.target.key = "a very, very long name of a monster that goes on and on and on"
+        self.combathandler.get_sides = Mock(return_value=([], [self.target]))
+
+        result = strip_ansi(self.combathandler.get_combat_summary(self.combatant))
+
+        self.assertEqual(result, " testchar (Perfect)  vs  a very, very long na[...] (Perfect) ")
+
+        # a long name on both sides uses up the full width
+        self.combatant.key = self.target.key
+        self.combathandler.get_sides = Mock(return_value=([], [self.target]))
+        result = strip_ansi(self.combathandler.get_combat_summary(self.combatant))
+        self.assertEqual(len(result), 78)
+
 
 class TestCombatActionsBase(_CombatTestBase):
     """
@@ -349,8 +395,8 @@ class EvAdventureTurnbasedCombatHandlerTest(_CombatTestBase):
             },
         )
         self.assertEqual(chandler.flee_timeout, 1)
-        self.assertEqual(dict(chandler.advantage_matrix), {})
-        self.assertEqual(dict(chandler.disadvantage_matrix), {})
+        self.assertEqual(set(chandler.advantage_pairs), set())
+        self.assertEqual(set(chandler.disadvantage_pairs), set())
         self.assertEqual(dict(chandler.fleeing_combatants), {})
         self.assertEqual(dict(chandler.defeated_combatants), {})
 
@@ -389,20 +435,62 @@ class EvAdventureTurnbasedCombatHandlerTest(_CombatTestBase):
         allies, enemies = self.combathandler.get_sides(self.target)
         self.assertEqual((allies, enemies), ([target2], [self.combatant, combatant2]))
 
+    def test_get_sides__combatants_change(self):
+        """The sides follow combatants being added, removed and defeated"""
+
+        self.assertEqual(self.combathandler.get_sides(self.combatant), ([], [self.target]))
+
+        combatant2 = create.create_object(
+            EvAdventureCharacter, key="testchar2", location=self.location
+        )
+        target2 = create.create_object(
+            EvAdventureMob,
+            key="testmonster2",
+            location=self.location,
+            attributes=(("is_idle", True),),
+        )
+        self.combathandler.add_combatant(combatant2)
+        self.combathandler.add_combatant(target2)
+        self.assertEqual(
+            self.combathandler.get_sides(self.combatant), ([combatant2], [self.target, target2])
+        )
+
+        self.combathandler.remove_combatant(combatant2)
+        self.assertEqual(self.combathandler.get_sides(self.combatant), ([], [self.target, target2]))
+
+        target2.hp = 0
+        target2.at_defeat = Mock()
+        self.combathandler.check_stop_combat()
+        self.assertEqual(self.combathandler.get_sides(self.combatant), ([], [self.target]))
+
+    def test_advantage_is_used_up(self):
+        """Advantage/disadvantage only applies to the next check"""
+
+        self.combathandler.give_advantage(self.combatant, self.target)
+        self.combathandler.give_disadvantage(self.target, self.combatant)
+
+        self.assertFalse(self.combathandler.has_advantage(self.target, self.combatant))
+        self.assertTrue(self.combathandler.has_advantage(self.combatant, self.target))
+        self.assertFalse(self.combathandler.has_advantage(self.combatant, self.target))
+
+        self.assertTrue(self.combathandler.has_disadvantage(self.target, self.combatant))
+        self.assertFalse(self.combathandler.has_disadvantage(self.target, self.combatant))
+
     def test_queue_and_execute_action(self):
         """Queue actions and execute"""
 
         hold = {"key": "hold"}
 
+        # the action class is resolved when queueing
+        mock_action = Mock()
+        self.combathandler.action_classes["hold"] = Mock(return_value=mock_action)
+
         self.combathandler.queue_action(self.combatant, hold)
         self.assertEqual(
             dict(self.combathandler.combatants),
             {self.combatant: {"key": "hold"}, self.target: {"key": "hold"}},
         )
 
-        mock_action = Mock()
-        self.combathandler.action_classes["hold"] = Mock(return_value=mock_action)
-
         self.combathandler.execute_next_action(self.combatant)
 
         self.combathandler.action_classes["hold"].assert_called_with(
@@ -410,6 +498,64 @@ class EvAdventureTurnbasedCombatHandlerTest(_CombatTestBase):
         )
         mock_action.execute.assert_called_once()
 
+    def test_queue_action__everyone_queued(self):
+        """The turn is forced once all combatants have queued an action"""
+
+        self.combathandler.force_repeat = Mock()
+
+        self.combathandler.queue_action(self.combatant, {"key": "hold"})
+        self.combathandler.force_repeat.assert_not_called()
+        self.combathandler.queue_action(self.target, {"key": "hold"})
+        self.combathandler.force_repeat.assert_called_once()
+
+    def test_execute_next_action__reuse_repeating_action(self):
+        """A repeating action is only created once"""
+
+        attack = {"key": "attack", "target": self.target, "repeat": True}
+
+        mock_action_class = Mock()
+        with patch.dict(self.combathandler.action_classes, {"attack": mock_action_class}):
+            self.combathandler.queue_action(self.combatant, attack)
+            self.combathandler.execute_next_action(self.combatant)
+            self.combathandler.execute_next_action(self.combatant)
+
+            mock_action_class.assert_called_once()
+            self.assertEqual(mock_action_class.return_value.execute.call_count, 2)
+
+            # a changed action-dict gets a new action
+            attack_once = {"key": "attack", "target": self.target}
+            self.combathandler.queue_action(self.combatant, attack_once)
+            self.combathandler.execute_next_action(self.combatant)
+
+        self.assertEqual(mock_action_class.call_count, 2)
+        mock_action_class.assert_called_with(self.combathandler, self.combatant, attack_once)
+
+    def test_execute_next_action__defeated_and_readded(self):
+        """A combatant re-added after being defeated does not keep its old action"""
+
+        attack = {"key": "attack", "target": self.target, "repeat": True}
+        mock_attack_class, mock_hold_class = Mock(), Mock()
+        self.combatant.at_defeat = Mock()
+        self.combathandler.stop_combat = Mock()
+
+        with patch.dict(
+            self.combathandler.action_classes,
+            {"attack": mock_attack_class, "hold": mock_hold_class},
+        ):
+            self.combathandler.queue_action(self.combatant, attack)
+            self.combathandler.execute_next_action(self.combatant)
+
+            self.combatant.hp = 0
+            self.combathandler.check_stop_combat()
+            self.assertNotIn(self.combatant, self.combathandler.combatants)
+
+            self.combatant.hp = self.combatant.hp_max
+            self.combathandler.add_combatant(self.combatant)
+            self.combathandler.execute_next_action(self.combatant)
+
+        self.assertEqual(mock_attack_class.return_value.execute.call_count, 1)
+        mock_hold_class.return_value.execute.assert_called_once()
+
     def test_execute_full_turn(self):
         """Run a full (passive) turn"""
 
@@ -426,6 +572,51 @@ class EvAdventureTurnbasedCombatHandlerTest(_CombatTestBase):
             [call(self.combatant), call(self.target)], any_order=True
         )
 
+    def test_execute_full_turn__combatants_change(self):
+        """The turn order follows combatants being added, removed and defeated"""
+
+        def _get_acting():
+            mock_execute.reset_mock()
+            self.combathandler.at_repeat()
+            return {args[0] for args, _ in mock_execute.call_args_list}
+
+        mock_execute = self.combathandler.execute_next_action = Mock()
+        self.assertEqual(_get_acting(), {self.combatant, self.target})
+
+        combatant2 = create.create_object(
+            EvAdventureCharacter, key="testchar2", location=self.location
+        )
+        target2 = create.create_object(
+            EvAdventureMob,
+            key="testmonster2",
+            location=self.location,
+            attributes=(("is_idle", True),),
+        )
+        self.combathandler.add_combatant(combatant2)
+        self.combathandler.add_combatant(target2)
+        self.assertEqual(_get_acting(), {self.combatant, self.target, combatant2, target2})
+
+        self.combathandler.remove_combatant(combatant2)
+        self.assertEqual(_get_acting(), {self.combatant, self.target, target2})
+
+        # defeated at the end of this turn, so not acting in the next one
+        target2.hp = 0
+        target2.at_defeat = Mock()
+        self.combathandler.at_repeat()
+        self.assertEqual(_get_acting(), {self.combatant, self.target})
+
+    def test_execute_full_turn__own_rng(self):
+        """The turn order is shuffled with the handler's own random generator"""
+
+        rng = self.combathandler._get_rng()
+        self.assertIs(rng, self.combathandler._get_rng())
+
+        self.combathandler.execute_next_action = Mock()
+        with patch.object(rng, "shuffle") as mock_shuffle:
+            self.combathandler.at_repeat()
+
+        mock_shuffle.assert_called_once_with([self.combatant, self.target])
+
     def test_action__action_ticks_turn(self):
         """Test that action execution ticks turns"""
 
@@ -445,6 +636,10 @@ class EvAdventureTurnbasedCombatHandlerTest(_CombatTestBase):
         self.assertEqual(self.target.hp, -7)
         # after this the combat is over
         self.assertIsNone(self.combathandler.pk)
+        # the end-of-combat report is sent as one multi-line message
+        text, _ = self.combatant.msg.call_args.kwargs["text"]
+        self.assertTrue(text.startswith("The combat is over."))
+        self.assertTrue(text.endswith("\ntestmonster were killed."))
 
     @patch("evennia.contrib.tutorials.evadventure.combat_base.rules.randint")
     def test_stunt_fail(self, mock_randint):
@@ -458,8 +653,8 @@ class EvAdventureTurnbasedCombatHandlerTest(_CombatTestBase):
         }
         mock_randint.return_value = 8  # fails 8+1 dex vs DEX 11 defence
         self._run_actions(action_dict)
-        self.assertEqual(self.combathandler.advantage_matrix[self.combatant], {})
-        self.assertEqual(self.combathandler.disadvantage_matrix[self.combatant], {})
+        self.assertEqual(set(self.combathandler.advantage_pairs), set())
+        self.assertEqual(set(self.combathandler.disadvantage_pairs), set())
 
     @patch("evennia.contrib.tutorials.evadventure.combat_base.rules.randint")
     def test_stunt_advantage__success(self, mock_randint):
@@ -474,9 +669,7 @@ class EvAdventureTurnbasedCombatHandlerTest(_CombatTestBase):
         }
         mock_randint.return_value = 11  # 11+1 dex vs DEX 11 defence is success
         self._run_actions(action_dict)
-        self.assertEqual(
-            bool(self.combathandler.advantage_matrix[self.combatant][self.target]), True
-        )
+        self.assertIn((self.combatant, self.target), self.combathandler.advantage_pairs)
 
     @patch("evennia.contrib.tutorials.evadventure.combat_base.rules.randint")
     def test_stunt_disadvantage__success(self, mock_randint):
@@ -491,9 +684,7 @@ class EvAdventureTurnbasedCombatHandlerTest(_CombatTestBase):
         }
         mock_randint.return_value = 11  # 11+1 dex vs DEX 11 defence is success
         self._run_actions(action_dict)
-        self.assertEqual(
-            bool(self.combathandler.disadvantage_matrix[self.target][self.combatant]), True
-        )
+        self.assertIn((self.target, self.combatant), self.combathandler.disadvantage_pairs)
 
     def test_flee__success(self):
         """
@@ -529,6 +720,217 @@ class EvAdventureTurnbasedCombatHandlerTest(_CombatTestBase):
         # this ends combat, so combathandler should be gone
         self.assertIsNone(self.combathandler.pk)
 
+    def test_flee__queue(self):
+        """Fleeing combatants are queued by the turn they will escape"""
+
+        self.combathandler.flee_timeout = 3
+        # the queue is normally created lazily the first time it's needed
+        self.assertEqual(self.combathandler._get_flee_queue(), [])
+
+        self._run_actions({"key": "flee", "repeat": True})
+        self.assertEqual(
+            self.combathandler.ndb._flee_queue, [(3, self.combatant.id, self.combatant)]
+        )
+
+    def test_flee__advantage(self):
+        """Fleeing gives enemies advantage, also if the cache has to be rebuilt"""
+
+        self.combathandler.flee_timeout = 3
+        self.assertFalse(self.combathandler.has_advantage(self.target, self.combatant))
+
+        self._run_actions({"key": "flee", "repeat": True})
+        self.assertEqual(self.combathandler.ndb._fleeing_set, {self.combatant})
+        self.assertTrue(self.combathandler.has_advantage(self.target, self.combatant))
+
+        # simulate a reload
+        self.combathandler.ndb._fleeing_set = None
+        self.assertTrue(self.combathandler.has_advantage(self.target, self.combatant))
+        self.assertEqual(self.combathandler.ndb._fleeing_set, {self.combatant})
+
+        self.combathandler.remove_combatant(self.combatant)
+        self.assertEqual(self.combathandler.ndb._fleeing_set, set())
+
+    def test_flee__readded(self):
+        """A combatant re-added to combat is no longer fleeing, but can flee anew"""
+
+        self.combathandler.flee_timeout = 2
+        self._run_actions({"key": "flee", "repeat": True})  # would escape on turn 2
+
+        self.combathandler.remove_combatant(self.combatant)
+        self.combathandler.add_combatant(self.combatant)
+        self.assertNotIn(self.combatant, self.combathandler.fleeing_combatants)
+        self.assertFalse(self.combathandler.has_advantage(self.target, self.combatant))
+
+        # simulate a reload
+        self.combathandler.ndb._fleeing_set = None
+        self.combathandler.ndb._flee_queue = None
+        self.assertFalse(self.combathandler.has_advantage(self.target, self.combatant))
+
+        self._run_actions({"key": "hold"})
+        self.assertIn(self.combatant, self.combathandler.combatants)
+
+        self._run_actions({"key": "flee", "repeat": True})  # escapes on turn 4
+        self.assertTrue(self.combathandler.has_advantage(self.target, self.combatant))
+
+        # simulate a reload
+        self.combathandler.ndb._fleeing_set = None
+        self.combathandler.ndb._flee_queue = None
+        self.assertTrue(self.combathandler.has_advantage(self.target, self.combatant))
+
+        # escaping ends combat, so combathandler should be gone
+        self._run_actions({"key": "flee", "repeat": True})
+        self.assertIsNone(self.combathandler.pk)
+
+    def test_get_combathandler__from_menu(self):
+        """The combat menu remembers its combathandler"""
+        evmenu = Mock(combathandler=None)
+        self.combatant.ndb._evmenu = evmenu
+
+        self.assertEqual(combat_turnbased._get_combathandler(self.combatant), self.combathandler)
+        self.assertEqual(evmenu.combathandler, self.combathandler)
+
+        with patch.object(
+            combat_turnbased.EvAdventureTurnbasedCombatHandler, "get_or_create_combathandler"
+        ) as mock_get_or_create:
+            self.assertEqual(
+                combat_turnbased._get_combathandler(self.combatant), self.combathandler
+            )
+            mock_get_or_create.assert_not_called()
+
+            # moving elsewhere means a new lookup
+            self.combatant.location = create.create_object(EvAdventureRoom, key="testroom2")
+            combat_turnbased._get_combathandler(self.combatant)
+            mock_get_or_create.assert_called_once()
+
+    def test_get_default_wizard_options(self):
+        """The back/abort/default options appended to every wizard node"""
+        kwargs = {"steps": ["node_choose_enemy_target"], "istep": 0}
+        back, abort, default = combat_turnbased._get_default_wizard_options(
+            self.combatant, **kwargs
+        )
+        self.assertEqual(back["goto"], (combat_turnbased._step_wizard_back, kwargs))
+        goto, goto_kwargs = back["goto"]
+        self.assertEqual(goto(self.combatant, "", **goto_kwargs), "node_combat")
+        self.assertIs(abort, combat_turnbased._WIZARD_ABORT_OPTION)
+        self.assertEqual(default["goto"], (combat_turnbased._rerun_current_node, kwargs))
+
+    def test_step_wizard(self):
+        """Step back and forth through the wizard"""
+        steps = ["node_choose_ability", "node_choose_enemy_target"]
+        action_dict = {"key": "stunt"}
+
+        node, kwargs = combat_turnbased._step_wizard(
+            self.combatant, "", steps=steps, action_dict=action_dict
+        )
+        self.assertEqual(node, "node_choose_ability")
+        self.assertEqual(kwargs, {"steps": steps, "istep": 0, "action_dict": action_dict})
+
+        node, kwargs = combat_turnbased._step_wizard(self.combatant, "", **kwargs)
+        self.assertEqual(node, "node_choose_enemy_target")
+
+        # stepping back must not make the next choice step back too
+        node, kwargs = combat_turnbased._step_wizard(self.combatant, "", step="back", **kwargs)
+        self.assertEqual(node, "node_choose_ability")
+        self.assertEqual(kwargs, {"steps": steps, "istep": 0, "action_dict": action_dict})
+        node, kwargs = combat_turnbased._step_wizard(self.combatant, "", **kwargs)
+        self.assertEqual(node, "node_choose_enemy_target")
+
+    def test_node_combat__attack(self):
+        """Walk through the attack wizard, without touching the shared action-dicts"""
+        _, options = combat_turnbased.node_combat(self.combatant, "")
+        self.assertIs(options, combat_turnbased._COMBAT_MENU_OPTIONS)
+        goto, kwargs = options[0]["goto"]
+        node, kwargs = goto(self.combatant, "", **kwargs)
+        self.assertEqual(node, "node_choose_enemy_target")
+
+        _, options = combat_turnbased.node_choose_enemy_target(self.combatant, "", **kwargs)
+        self.assertEqual(
+            options[0]["goto"][1]["action_dict"],
+            {"key": "attack", "target": self.target, "repeat": True},
+        )
+        self.assertEqual(
+            combat_turnbased._ATTACK_ACTION_DICT, {"key": "attack", "target": None, "repeat": True}
+        )
+
+    def test_node_choose_use_item(self):
+        """The usable items are only looked up once per wizard run"""
+        potion = create.create_object(
+            EvAdventureConsumable, key="potion", attributes=[("uses", 2)], location=self.combatant
+        )
+        self.combatant.ndb._evmenu = Mock(backpack_items=None, combathandler=None)
+        kwargs = {"steps": ["node_choose_use_item"], "istep": 0, "action_dict": {"key": "use"}}
+
+        with patch.object(
+            self.combatant.equipment,
+            "get_usable_objects_from_backpack",
+            wraps=self.combatant.equipment.get_usable_objects_from_backpack,
+        ) as mock_get_usable:
+            _, options = combat_turnbased.node_choose_use_item(self.combatant, "", **kwargs)
+            combat_turnbased.node_choose_use_item(self.combatant, "", **kwargs)
+            self.assertEqual(mock_get_usable.call_count, 1)
+
+            # returning to the main combat node starts over
+            combat_turnbased.node_combat(self.combatant, "")
+            combat_turnbased.node_choose_use_item(self.combatant, "", **kwargs)
+            self.assertEqual(mock_get_usable.call_count, 2)
+
+        self.assertEqual(options[0]["goto"][1]["action_dict"], {"key": "use", "item": potion})
+
+    @patch("evennia.contrib.tutorials.evadventure.combat_turnbased.EvMenu")
+    def test_attack_command(self, mock_evmenu):
+        """Attacking queues the attack, warns the target and opens the combat menu"""
+        cmd = combat_turnbased.CmdTurnAttack()
+        cmd.caller = self.combatant
+        cmd.args = self.target.key
+        self.combathandler.start_combat = Mock()
+
+        cmd.func()
+
+        self.assertEqual(
+            self.combathandler.combatants[self.combatant], {"key": "attack", "target": self.target}
+        )
+        self.target.msg.assert_called_with("|rYou are attacked by testchar!|n")
+        self.combathandler.start_combat.assert_called_once()
+        mock_evmenu.assert_called_once()
+
+    def test_attack_command__invalid_target(self):
+        """Only living things with health can be attacked"""
+        cmd = combat_turnbased.CmdTurnAttack()
+        cmd.caller = self.combatant
+        cmd.msg = Mock()
+
+        create.create_object(key="rock", location=self.location)
+        cmd.args = "rock"
+        cmd.func()
+        cmd.msg.assert_called_with("You can't attack that.")
+
+        self.target.hp = 0
+        cmd.args = self.target.key
+        cmd.func()
+        cmd.msg.assert_called_with("testmonster is already down.")
+
+    def test_node_choose_ability(self):
+        """Each ability can be picked once, carrying along the wizard state"""
+        kwargs = {"steps": ["node_choose_ability"], "istep": 0, "action_dict": {"key": "stunt"}}
+        _, options = combat_turnbased.node_choose_ability(self.combatant, "", **kwargs)
+
+        ability_options = options[:-3]
+        self.assertEqual(
+            [option["desc"] for option in ability_options],
+            ["strength", "dexterity", "constitution", "intelligence", "wisdom", "charisma"],
+        )
+        self.assertEqual(
+            ability_options[1]["goto"][1],
+            {
+                **kwargs,
+                "action_dict": {
+                    "key": "stunt",
+                    "stunt_type": Ability.DEX,
+                    "defense_type": Ability.DEX,
+                },
+            },
+        )
+
 
 class TestEvAdventureTwitchCombatHandler(EvenniaCommandTestMixin, _CombatTestBase):
     def setUp(self):
@@ -618,12 +1020,37 @@ class TestEvAdventureTwitchCombatHandler(EvenniaCommandTestMixin, _CombatTestBas
             text=("The combat is over.", {}), from_obj=self.combatant
         )
 
+    @patch("evennia.contrib.tutorials.evadventure.combat_twitch.unrepeat", new=Mock())
+    def test_stop_combat(self):
+        """Stopping combat removes the look cmdset, but only if it's there"""
+        self.assertTrue(self.combatant.cmdset.has(combat_twitch.TwitchLookCmdSet))
+        self.combatant_combathandler.stop_combat()
+        self.assertFalse(self.combatant.cmdset.has(combat_twitch.TwitchLookCmdSet))
+
+        self.target.cmdset.remove(combat_twitch.TwitchLookCmdSet)
+        with patch.object(self.target.cmdset, "remove") as mock_remove:
+            self.target_combathandler.stop_combat()
+        mock_remove.assert_not_called()
+
     @patch("evennia.contrib.tutorials.evadventure.combat_twitch.unrepeat", new=Mock())
     @patch("evennia.contrib.tutorials.evadventure.combat_twitch.repeat", new=Mock())
     def test_hold(self):
         self.call(combat_twitch.CmdHold(), "", "You hold back, doing nothing")
         self.assertEqual(self.combatant_combathandler.action_dict, {"key": "hold"})
 
+    def test_no_combat_allowed(self):
+        self.location.allow_combat = False
+        self.call(combat_twitch.CmdHold(), "", "Can't fight here!")
+        self.assertEqual(self.combatant_combathandler.action_dict, {})
+
+    def test_look(self):
+        """Look adds a combat summary, headed by a line as wide as the summary"""
+        self.combatant_combathandler.get_sides = Mock(return_value=([], [self.target]))
+
+        with patch.object(combat_twitch, "pad", wraps=combat_twitch.pad) as mock_pad:
+            self.call(combat_twitch.CmdLook(), "", "@")
+        mock_pad.assert_called_once_with(" Combat Status ", width=47, fillchar="-")
+
     @patch("evennia.contrib.tutorials.evadventure.combat_twitch.unrepeat", new=Mock())
     @patch("evennia.contrib.tutorials.evadventure.combat_twitch.repeat", new=Mock())
     def test_attack(self):
@@ -634,6 +1061,15 @@ class TestEvAdventureTwitchCombatHandler(EvenniaCommandTestMixin, _CombatTestBas
             {"key": "attack", "target": self.target, "dt": 3, "repeat": True},
         )
 
+        # only things with health can be attacked
+        create.create_object(key="rock", location=self.location)
+        self.call(combat_twitch.CmdAttack(), "rock", "You can't attack that!")
+
+        # attacking someone not yet in combat creates their combathandler
+        target2 = create.create_object(EvAdventureMob, key="testmonster2", location=self.location)
+        self.call(combat_twitch.CmdAttack(), target2.key, "You attack testmonster2!")
+        self.assertEqual(target2.scripts.get("combathandler").first().key, "combathandler")
+
     @patch("evennia.contrib.tutorials.evadventure.combat_twitch.unrepeat", new=Mock())
     @patch("evennia.contrib.tutorials.evadventure.combat_twitch.repeat", new=Mock())
     def test_stunt(self):
@@ -688,6 +1124,13 @@ class TestEvAdventureTwitchCombatHandler(EvenniaCommandTestMixin, _CombatTestBas
         )
         self.assertEqual(self.combatant_combathandler.action_dict, foil_result)
 
+        self.call(
+            combat_twitch.CmdStunt(),
+            f"LCK {self.target.key}",
+            "'lck' is not a valid ability. Pick one of str, dex, con, int, wis, cha.",
+            cmdstring="boost",
+        )
+
     @patch("evennia.contrib.tutorials.evadventure.combat_twitch.unrepeat", new=Mock())
     @patch("evennia.contrib.tutorials.evadventure.combat_twitch.repeat", new=Mock())
     def test_useitem(self):
@@ -711,6 +1154,17 @@ class TestEvAdventureTwitchCombatHandler(EvenniaCommandTestMixin, _CombatTestBas
             {"key": "use", "item": item, "target": self.target, "dt": 3},
         )
 
+        self.combatant_combathandler.action_dict = {"key": "hold"}
+        self.call(
+            combat_twitch.CmdUseItem(),
+            f"potion {self.target.key}",
+            "You prepare to use potion!",
+        )
+        self.assertEqual(
+            self.combatant_combathandler.action_dict,
+            {"key": "use", "item": item, "target": self.target, "dt": 3},
+        )
+
     @patch("evennia.contrib.tutorials.evadventure.combat_twitch.unrepeat", new=Mock())
     @patch("evennia.contrib.tutorials.evadventure.combat_twitch.repeat", new=Mock())
     def test_wield(self):
@@ -728,3 +1182,5 @@ class TestEvAdventureTwitchCombatHandler(EvenniaCommandTestMixin, _CombatTestBas
         self.assertEqual(
             self.combatant_combathandler.action_dict, {"key": "wield", "item": runestone, "dt": 3}
         )
+
+        self.call(combat_twitch.CmdWield(), "  ", "What do you want to wield?")